@@ -2,7 +2,11 @@
 API endpoints for Skier AI Tagging plugin tag list editor.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import functools
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, Dict
 from sqlalchemy.orm import Session
@@ -16,10 +20,19 @@ logger = logging.getLogger(__name__)
 
 # Create router with prefix for tag endpoints
 # Note: main.py will add /api/v1/plugins prefix, so this should be relative to that
-router = APIRouter(prefix="/settings/skier_aitagging/tags", tags=["skier_aitagging"])
+router = APIRouter(
+    prefix="/settings/skier_aitagging/tags",
+    tags=["skier_aitagging"],
+    default_response_class=ORJSONResponse,
+)
 
 PLUGIN_NAME = "skier_aitagging"
 
+# Settings pages poll these endpoints; re-check the plugin's active state at most this often.
+PLUGIN_STATUS_CACHE_SECONDS = 5.0
+
+_plugin_active_until: dict[str, float] = {}
+
 
 class TagSettingUpdate(BaseModel):
     """Single tag setting update."""
@@ -36,50 +49,64 @@ class TagSettingsUpdate(BaseModel):
     tag_settings: Dict[str, TagSettingUpdate]  # Map of tag name (normalized) to settings
 
 
-@router.get("/available")
-async def get_plugin_available_tags(db: Session = Depends(get_db)):
-    """Get available tags for a plugin that supports tag editing.
+@functools.lru_cache(maxsize=8)
+def _get_plugin_service(plugin_name: str):
+    """Find the registered service for a plugin.
 
-    Uses the plugin service method to get tags. Service handles CSV vs legacy mode internally.
+    The result is memoized; call ``_get_plugin_service.cache_clear()`` whenever
+    services are (re)registered. A missing service raises instead of returning
+    None so the miss is never cached.
     """
+    for svc in services_registry.services.list():
+        if getattr(svc, "plugin_name", None) == plugin_name:
+            return svc
+    raise HTTPException(status_code=404, detail="Plugin service not found")
+
+
+def invalidate_plugin_status_cache() -> None:
+    """Forget cached active-state checks (call on plugin activation/deactivation)."""
+    _plugin_active_until.clear()
+
+
+def require_active_plugin(db: Session = Depends(get_db)) -> None:
+    """Dependency that rejects requests while the plugin is inactive."""
+    now = time.monotonic()
+    if _plugin_active_until.get(PLUGIN_NAME, 0.0) > now:
+        return
     _require_plugin_active(db, PLUGIN_NAME)
+    _plugin_active_until[PLUGIN_NAME] = now + PLUGIN_STATUS_CACHE_SECONDS
 
-    service = None
-    for svc in services_registry.services.list():
-        if getattr(svc, "plugin_name", None) == PLUGIN_NAME:
-            service = svc
-            break
 
-    if service is None:
-        raise HTTPException(status_code=404, detail="Plugin service not found")
+def get_active_plugin_service(_: None = Depends(require_active_plugin)):
+    """Dependency resolving the plugin service once the plugin is known to be active."""
+    return _get_plugin_service(PLUGIN_NAME)
+
 
+@router.get("/available", response_model=None)
+async def get_plugin_available_tags(service=Depends(get_active_plugin_service)):
+    """Get available tags for a plugin that supports tag editing.
+
+    Uses the plugin service method to get tags. Service handles CSV vs legacy mode internally.
+    """
     try:
-        result = await logic.get_available_tags_data(service=service)
-        return result
+        content = await logic.get_available_tags_json(service=service)
     except Exception as exc:
         logger.exception("Failed to get available tags for plugin %s", PLUGIN_NAME)
         raise HTTPException(status_code=500, detail=str(exc))
+    return Response(content=content, media_type="application/json")
 
 
-@router.put("/settings")
-async def update_plugin_tag_settings(payload: TagSettingsUpdate, db: Session = Depends(get_db)):
+@router.put("/settings", response_model=None, dependencies=[Depends(require_active_plugin)])
+async def update_plugin_tag_settings(payload: TagSettingsUpdate):
     """Update full tag settings for a plugin."""
-    _require_plugin_active(db, PLUGIN_NAME)
-
     try:
-        # Convert Pydantic models to dicts
-        settings_dict = {}
-        for tag_name, setting_update in payload.tag_settings.items():
-            settings_dict[tag_name] = {
-                "scene_tag_enabled": setting_update.scene_tag_enabled,
-                "markers_enabled": setting_update.markers_enabled,
-                "image_enabled": setting_update.image_enabled,
-                "required_scene_tag_duration": setting_update.required_scene_tag_duration,
-                "min_marker_duration": setting_update.min_marker_duration,
-                "max_gap": setting_update.max_gap,
-            }
-
-        result = logic.update_tag_settings(settings_dict)
+        # Build the lowercase-keyed settings map once; logic passes it straight through
+        settings_dict = {
+            tag_name.lower(): setting_update.model_dump()
+            for tag_name, setting_update in payload.tag_settings.items()
+        }
+
+        result = await logic.update_tag_settings(settings_dict)
         return result
     except Exception as exc:
         logger.exception("Failed to update tag settings for plugin %s", PLUGIN_NAME)
@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+import csv
 import logging
 import time
-from typing import Sequence, TypeVar, Awaitable
+from pathlib import Path
+from typing import Iterable, Sequence, TypeVar, Awaitable
+
+import orjson
 from stash_ai_server.actions.models import ContextInput
 from stash_ai_server.tasks.models import TaskRecord
 
 from .models import AIModelInfo, TagTimeFrame
 from .stash_handler import (
-    AI_Tagged_Tag_Id,
-    add_error_tag_to_images,
+    add_error_tag_to_images_async,
+    get_ai_tagged_tag_id,
     has_ai_tagged,
     has_ai_reprocess,
     is_vr_scene,
     resolve_ai_tag_reference,
     remove_reprocess_tag_from_images,
     remove_reprocess_tag_from_scene,
+    warm_ai_tag_ids,
 )
 from .http_handler import call_images_api, call_scene_api, get_active_scene_models
 from .utils import (
@@ -44,9 +49,6 @@ from stash_ai_server.db.ai_results_store import (
     store_scene_run_async,
     purge_scene_categories,
 )
-import csv
-import logging
-from .http_handler import get_active_scene_models
 
 _log = logging.getLogger(__name__)
 
@@ -61,6 +63,17 @@ STASH_CALL_TIMEOUT_SECONDS = 30.0
 
 next_cache_refresh_time = 0.0
 
+# Tag list editor caches: parsed CSV rows keyed on file mtime, and a short-lived models list
+AVAILABLE_MODELS_CACHE_SECONDS = 10.0
+_available_tags_cache: tuple[tuple[str, int, int, int], object, list[dict], dict] | None = None
+_available_models_cache: tuple[float, list[AIModelInfo]] | None = None
+_available_models_lock = asyncio.Lock()
+_available_tags_result: tuple[list[dict], list[AIModelInfo], dict] | None = None
+_available_tags_json: tuple[dict, bytes] | None = None
+
+# Placeholder rows in the tag CSV that are not real tags
+_SKIP_TAG_NAMES = frozenset({'', '*', 'default', 'unused1', 'unused2', 'unused3', 'unused4'})
+
 T = TypeVar("T")
 
 
@@ -71,6 +84,24 @@ async def _with_stash_timeout(coro: Awaitable[T], operation: str) -> T:
         raise TimeoutError(f"Stash call timed out during {operation}") from exc
 
 
+async def _gather_limited(limit: int, awaitables: Iterable[Awaitable[T]]) -> list[T | BaseException]:
+    """Await ``awaitables`` with at most ``limit`` running at once; exceptions are returned."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def _run(awaitable: Awaitable[T]) -> T:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(_run(awaitable) for awaitable in awaitables), return_exceptions=True)
+
+
+async def _tag_errored_images(image_ids: list[int]) -> None:
+    try:
+        await _with_stash_timeout(add_error_tag_to_images_async(image_ids), "add_error_tag_to_images")
+    except Exception:
+        _log.exception("Failed to add AI_Errored tag to image_ids=%s", image_ids)
+
+
 def _short_error(message: str, *, limit: int = 120) -> str:
     return message if len(message) <= limit else message[: limit - 3] + "..."
 
@@ -194,9 +225,7 @@ async def tag_images_task(ctx: ContextInput, params: dict) -> dict:
         record = (image_metadata or {}).get(image_id) or {}
         path = record.get("path") if isinstance(record, dict) else None
         tags = record.get("tag_ids") if isinstance(record, dict) else None
-        print("Image ID %s has tags: %s" % (image_id, tags))
         if has_ai_reprocess(tags):
-            print("Image ID %s has AI_Reprocess tag; scheduling reprocess" % image_id)
             reprocess_request_ids.add(image_id)
         if not path:
             failure_reasons[image_id] = "file path unavailable"
@@ -223,11 +252,16 @@ async def tag_images_task(ctx: ContextInput, params: dict) -> dict:
     remote_targets: dict[int, str] = {}
     determine_errors: list[int] = []
 
-    for image_id, path in valid_paths.items():
-        try:
-            historical_models = await get_image_model_history_async(service=service.name, image_id=image_id)
-        except Exception:
-            _log.exception("Failed to load image model history for image_id=%s", image_id)
+    # Load image model histories concurrently, bounded by the service's concurrency limit
+    history_results = await _gather_limited(
+        service.max_concurrency,
+        (get_image_model_history_async(service=service.name, image_id=image_id) for image_id in valid_paths),
+    )
+    for (image_id, path), historical_models in zip(valid_paths.items(), history_results):
+        if isinstance(historical_models, BaseException):
+            _log.error(
+                "Failed to load image model history for image_id=%s", image_id, exc_info=historical_models
+            )
             historical_models = ()
             determine_errors.append(image_id)
 
@@ -255,7 +289,7 @@ async def tag_images_task(ctx: ContextInput, params: dict) -> dict:
             _log.debug("Images API metrics: %s", getattr(response, "metrics", None))
         except Exception:
             _log.exception("Remote image tagging failed for %d images", len(remote_image_ids))
-            add_error_tag_to_images(remote_image_ids)
+            await _tag_errored_images(remote_image_ids)
             for iid in remote_image_ids:
                 failure_reasons[iid] = "remote service request failed"
             failed_images.update(remote_image_ids)
@@ -264,16 +298,17 @@ async def tag_images_task(ctx: ContextInput, params: dict) -> dict:
         if response is not None:
             result_payload = response.result if isinstance(response.result, list) else []
             models_used = response.models if getattr(response, "models", None) else []
+            errored_ids: list[int] = []
             for idx, image_id in enumerate(remote_image_ids):
                 payload = result_payload[idx] if idx < len(result_payload) else {}
                 if isinstance(payload, dict) and payload.get("error"):
                     failure_reasons[image_id] = _short_error(str(payload.get("error")))
-                    add_error_tag_to_images([image_id])
+                    errored_ids.append(image_id)
                     failed_images.add(image_id)
                     continue
 
                 tags_by_category = extract_tags_from_response(payload if isinstance(payload, dict) else {})
-                resolved_records = collect_image_tag_records(tags_by_category, config)
+                resolved_records = await collect_image_tag_records(tags_by_category, config)
                 try:
                     await store_image_run_async(
                         service=service.name,
@@ -286,23 +321,34 @@ async def tag_images_task(ctx: ContextInput, params: dict) -> dict:
                 except Exception:
                     _log.exception("Failed to persist image tagging run for image_id=%s", image_id)
 
+            # Tag every errored image in one Stash request
+            if errored_ids:
+                await _tag_errored_images(errored_ids)
+
     tags_added_counts: dict[int, int] = {}
 
+    pending_ids = [image_id for image_id in image_ids if image_id not in failed_images]
+    stored_results = await _gather_limited(
+        service.max_concurrency,
+        (get_image_tag_ids_async(service=service.name, image_id=image_id) for image_id in pending_ids),
+    )
+    stored_by_image = dict(zip(pending_ids, stored_results))
+
     for image_id in image_ids:
         tags_added_counts[image_id] = 0
         if image_id in failed_images:
             continue
-        try:
-            stored_tag_ids = await get_image_tag_ids_async(service=service.name, image_id=image_id)
-        except Exception:
-            _log.exception("Failed to load stored image tags for image_id=%s", image_id)
+        stored_tag_ids = stored_by_image[image_id]
+        if isinstance(stored_tag_ids, BaseException):
+            _log.error("Failed to load stored image tags for image_id=%s", image_id, exc_info=stored_tag_ids)
             failure_reasons[image_id] = "failed to load stored tags"
             failed_images.add(image_id)
             continue
 
-        normalized_ids = filter_enabled_tag_ids(stored_tag_ids, config)
-        if apply_ai_tagged_tag and AI_Tagged_Tag_Id:
-            normalized_ids = list(dict.fromkeys([*normalized_ids, AI_Tagged_Tag_Id]))
+        normalized_ids = await filter_enabled_tag_ids(stored_tag_ids, config)
+        ai_tagged_tag_id = get_ai_tagged_tag_id()
+        if apply_ai_tagged_tag and ai_tagged_tag_id:
+            normalized_ids = list(dict.fromkeys([*normalized_ids, ai_tagged_tag_id]))
         tags_added_counts[image_id] = len(normalized_ids)
 
         if not normalized_ids and not stored_tag_ids:
@@ -472,7 +518,7 @@ async def tag_scene_task(ctx: ContextInput, params: dict, task_record: TaskRecor
                 "failed_ids": [],
             }
 
-        vr_scene = is_vr_scene(scene_tags)
+        vr_scene = await is_vr_scene(scene_tags)
         _log.debug(
             "Running scene tagging for scene_id=%s; skipping categories=%s",
             scene_id,
@@ -630,6 +676,7 @@ async def tag_scenes(service: RemoteServiceBase, ctx: ContextInput, params: dict
             "scenes_completed": 0,
             "scenes_failed": 0,
         }
+    await warm_ai_tag_ids()
     if len(selected_items) == 1:
         if not ctx.entity_id:
             ctx.entity_id = str(selected_items[0])
@@ -709,6 +756,7 @@ async def tag_images(service: RemoteServiceBase, ctx: ContextInput, params: dict
             "images_completed": 0,
             "images_failed": 0,
         }
+    await warm_ai_tag_ids()
     if len(selected_items) <= MAX_IMAGES_PER_REQUEST:
         return await tag_images_task(ctx, params)
 
@@ -787,116 +835,187 @@ async def tag_images(service: RemoteServiceBase, ctx: ContextInput, params: dict
 # ------------------------------------------------------------------
 
 
+def _parse_tags_csv(csv_path: Path, tag_config_obj) -> tuple[list[dict], dict] | None:
+    """Read the tag CSV into the tag list editor's tags and defaults.
+
+    Blocking; callers on the event loop should run it in a worker thread.
+    Returns None when the file has no header row.
+    """
+    tags_list = []
+    defaults = {}
+    tag_rows: list[tuple[str, list[str]]] = []
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            _log.warning("Tag settings CSV file is missing a header row")
+            return None
+
+        # Resolve column positions once; absent columns point at a blank padding cell
+        columns = {name: idx for idx, name in enumerate(header)}
+        blank = len(header)
+        width = blank + 1
+        i_tag = columns.get('tag_name', blank)
+        i_tag_alt = columns.get('tag', blank)
+        i_required = columns.get('RequiredSceneTagDuration', blank)
+        i_min_marker = columns.get('min_marker_duration', blank)
+        i_max_gap = columns.get('max_gap', blank)
+        i_markers = columns.get('markers_enabled')
+        i_category = columns.get('category', blank)
+
+        for row in reader:
+            # Drop any cells past the header (they would land on the padding slot),
+            # then pad short rows; the padding cell itself is always ''
+            del row[blank:]
+            row.extend([''] * (width - len(row)))
+
+            # Get tag name from CSV
+            tag_name = (row[i_tag] or row[i_tag_alt]).strip()
+            name_lc = tag_name.lower()
+
+            # Extract default values from __default__ row
+            if name_lc == '__default__':
+                defaults['required_scene_tag_duration'] = row[i_required].strip()
+                defaults['min_marker_duration'] = row[i_min_marker].strip()
+                defaults['max_gap'] = row[i_max_gap].strip()
+                markers_value = row[i_markers] if i_markers is not None else 'TRUE'
+                defaults['markers_enabled'] = markers_value.strip().upper() == 'TRUE'
+                continue
+
+            # Skip empty rows
+            if name_lc in _SKIP_TAG_NAMES:
+                continue
+
+            # Get categories from CSV row (pipe-delimited list)
+            raw_category = row[i_category].strip()
+            if raw_category:
+                categories = [c.strip() for c in raw_category.split('|') if c.strip()]
+            else:
+                categories = ['Other']
+            tag_rows.append((tag_name, categories))
+
+    # Resolve settings for every tag in one pass over the configuration
+    resolved = tag_config_obj.resolve_many(name for name, _ in tag_rows)
+    for tag_name, categories in tag_rows:
+        settings = resolved[tag_name]
+
+        # Format required_scene_tag_duration
+        req_duration_str = None
+        if settings.required_scene_tag_duration:
+            if settings.required_scene_tag_duration.unit == 'percent':
+                req_duration_str = f"{settings.required_scene_tag_duration.value}%"
+            else:
+                req_duration_str = str(settings.required_scene_tag_duration.value)
+
+        # Add tag with full settings
+        tags_list.append({
+            'tag': tag_name,
+            'name': tag_name,  # For compatibility
+            'categories': categories,
+            'scene_tag_enabled': settings.scene_tag_enabled,
+            'markers_enabled': settings.markers_enabled,
+            'image_enabled': settings.image_enabled,
+            'required_scene_tag_duration': req_duration_str,
+            'min_marker_duration': settings.min_marker_duration,
+            'max_gap': settings.max_gap,
+        })
+    return tags_list, defaults
+
+
+async def _get_available_models(service: RemoteServiceBase) -> list[AIModelInfo]:
+    """Fetch active models for the tag editor, reusing a recent result."""
+    global _available_models_cache
+
+    async with _available_models_lock:
+        now = time.monotonic()
+        cached = _available_models_cache
+        if cached is not None and now - cached[0] < AVAILABLE_MODELS_CACHE_SECONDS:
+            return cached[1]
+        models = await get_active_scene_models(service)
+        _available_models_cache = (now, models)
+        return models
+
+
 async def get_available_tags_data(service: RemoteServiceBase) -> dict:
     """Get available tags from CSV file with full settings.
 
     Returns:
         dict with 'tags' (full settings), 'models', and 'defaults' keys.
     """
-    
-    _log = logging.getLogger(__name__)
-    
+    global _available_tags_cache, _available_tags_result
+
     # Get tag config
     tag_config_obj = get_tag_configuration()
     
     # Read tags directly from CSV file
-    tags_list = []
-    defaults = {}
     csv_path = tag_config_obj.source_path
     
-    if not csv_path.exists():
+    try:
+        csv_stat = csv_path.stat()
+    except FileNotFoundError:
         _log.warning("Tag settings CSV file does not exist at %s", csv_path)
         return {'tags': [], 'models': [], 'defaults': {}}
-    
-    try:
-        with csv_path.open("r", encoding="utf-8", newline="") as handle:
-            reader = csv.DictReader(handle)
-            if reader.fieldnames is None:
-                _log.warning("Tag settings CSV file is missing a header row")
-                return {'tags': [], 'models': [], 'defaults': {}}
-            
-            for row in reader:
-                # Get tag name from CSV
-                tag_name = (row.get('tag_name') or row.get('tag') or '').strip()
-                
-                # Extract default values from __default__ row
-                if tag_name.lower() == '__default__':
-                    defaults['required_scene_tag_duration'] = row.get('RequiredSceneTagDuration', '').strip()
-                    defaults['min_marker_duration'] = row.get('min_marker_duration', '').strip()
-                    defaults['max_gap'] = row.get('max_gap', '').strip()
-                    defaults['markers_enabled'] = row.get('markers_enabled', 'TRUE').strip().upper() == 'TRUE'
-                    continue
-                
-                # Skip empty rows
-                if not tag_name or tag_name.lower() in {'', '*', 'default', 'unused1', 'unused2', 'unused3', 'unused4'}:
-                    continue
-                
-                # Get resolved settings for this tag
-                settings = tag_config_obj.resolve(tag_name)
-                
-                # Get categories from CSV row (pipe-delimited list)
-                raw_category = row.get('category', '').strip()
-                if raw_category:
-                    categories = [c.strip() for c in raw_category.split('|') if c.strip()]
-                else:
-                    categories = ['Other']
-                
-                # Format required_scene_tag_duration
-                req_duration_str = None
-                if settings.required_scene_tag_duration:
-                    if settings.required_scene_tag_duration.unit == 'percent':
-                        req_duration_str = f"{settings.required_scene_tag_duration.value}%"
-                    else:
-                        req_duration_str = str(settings.required_scene_tag_duration.value)
-                
-                # Add tag with full settings
-                tags_list.append({
-                    'tag': tag_name,
-                    'name': tag_name,  # For compatibility
-                    'categories': categories,
-                    'scene_tag_enabled': settings.scene_tag_enabled,
-                    'markers_enabled': settings.markers_enabled,
-                    'image_enabled': settings.image_enabled,
-                    'required_scene_tag_duration': req_duration_str,
-                    'min_marker_duration': settings.min_marker_duration,
-                    'max_gap': settings.max_gap,
-                })
-    except Exception as exc:
-        _log.exception("Failed to read tags from CSV file %s: %s", csv_path, exc)
-        return {'tags': [], 'models': [], 'defaults': {}, 'error': f'Failed to read CSV: {str(exc)}'}
+
+    # Reuse the parsed rows while neither the file nor the loaded configuration changed.
+    # Settings writes replace the file, so the inode catches edits within mtime granularity.
+    cache_key = (str(csv_path), csv_stat.st_mtime_ns, csv_stat.st_size, csv_stat.st_ino)
+    cached = _available_tags_cache
+    if cached is not None and cached[0] == cache_key and cached[1] is tag_config_obj:
+        tags_list, defaults = cached[2], cached[3]
+    else:
+        try:
+            parsed = await asyncio.to_thread(_parse_tags_csv, csv_path, tag_config_obj)
+        except Exception as exc:
+            _log.exception("Failed to read tags from CSV file %s: %s", csv_path, exc)
+            return {'tags': [], 'models': [], 'defaults': {}, 'error': f'Failed to read CSV: {str(exc)}'}
+        if parsed is None:
+            return {'tags': [], 'models': [], 'defaults': {}}
+        tags_list, defaults = parsed
+        _available_tags_cache = (cache_key, tag_config_obj, tags_list, defaults)
     
     # Fetch active models from nsfw backend
-    active_models = []
-    loaded_categories = set()
     try:
-        active_models_list = await get_active_scene_models(service)
-        if active_models_list:
-            for model in active_models_list:
-                # Convert AIModelInfo to dict for JSON serialization
-                model_dict = {
-                    'name': model.name,
-                    'identifier': model.identifier,
-                    'version': model.version,
-                    'categories': model.categories,
-                    'type': model.type,
-                }
-                active_models.append(model_dict)
-                # Extract all categories from this model
-                if model.categories:
-                    loaded_categories.update(model.categories)
+        active_models_list = await _get_available_models(service)
     except Exception as exc:
         # If backend is unavailable, log warning but continue (graceful degradation)
         _log.warning("Failed to fetch active models from nsfw backend: %s. Showing all tags.", exc)
+        active_models_list = []
+
+    # Same tags and models as last time: hand back the same payload object
+    cached_result = _available_tags_result
+    if cached_result is not None and cached_result[0] is tags_list and cached_result[1] is active_models_list:
+        return cached_result[2]
+
+    models = active_models_list or ()
+    # Convert AIModelInfo to dict for JSON serialization
+    active_models = [model.model_dump() for model in models]
+    # Collect all categories across the loaded models
+    loaded_categories = list({c for model in models for c in (model.categories or ())})
     
-    return {
+    result = {
         'tags': tags_list,
         'models': active_models,
-        'loaded_categories': list(loaded_categories),
+        'loaded_categories': loaded_categories,
         'defaults': defaults
     }
+    _available_tags_result = (tags_list, active_models_list, result)
+    return result
+
 
+async def get_available_tags_json(service: RemoteServiceBase) -> bytes:
+    """JSON-encoded ``get_available_tags_data`` payload, re-encoded only when the payload changes."""
+    global _available_tags_json
 
-def update_tag_settings(tag_settings: dict) -> dict:
+    result = await get_available_tags_data(service)
+    cached = _available_tags_json
+    if cached is not None and cached[0] is result:
+        return cached[1]
+    encoded = orjson.dumps(result)
+    _available_tags_json = (result, encoded)
+    return encoded
+
+
+async def update_tag_settings(tag_settings: dict) -> dict:
     """Update full tag settings for multiple tags.
     
     Args:
@@ -912,18 +1031,8 @@ def update_tag_settings(tag_settings: dict) -> dict:
         dict with 'status' and 'updated' count
     """
     tag_config_obj = get_tag_configuration()
-    
-    # Convert to format expected by tag_config
-    settings_map = {}
-    for tag_name, settings in tag_settings.items():
-        settings_map[tag_name] = {
-            'scene_tag_enabled': settings.get('scene_tag_enabled'),
-            'markers_enabled': settings.get('markers_enabled'),
-            'image_enabled': settings.get('image_enabled'),
-            'required_scene_tag_duration': settings.get('required_scene_tag_duration'),
-            'min_marker_duration': settings.get('min_marker_duration'),
-            'max_gap': settings.get('max_gap'),
-        }
-    
-    tag_config_obj.update_tag_settings(settings_map)
-    return {'status': 'ok', 'updated': len(tag_settings)}
\ No newline at end of file
+
+    # The map is already in the shape tag_config expects, so it is passed through
+    # as-is. Rewriting the CSV is blocking file I/O; keep it off the event loop
+    updated = await asyncio.to_thread(tag_config_obj.update_tag_settings, tag_settings)
+    return {'status': 'ok', 'updated': updated}
\ No newline at end of file
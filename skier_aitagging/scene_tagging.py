@@ -81,11 +81,10 @@ async def apply_scene_tags(
     for tag_id, duration in aggregate_totals.items():
         await _evaluate_tag(tag_id, duration)
 
-    # Remove anything we manage that is currently on the scene and in our ai tag cache
-    ai_cache = get_ai_tags_cache()
-    for tag_id in current_ai_tags:
-        if tag_id not in tags_to_add and tag_id in ai_cache.values():
-            tags_to_remove.add(tag_id)
+    # Remove anything we manage that is currently on the scene and in our ai tag cache.
+    # Snapshot the cached ids into a set once rather than scanning values() per tag.
+    managed_ids = set(get_ai_tags_cache().values())
+    tags_to_remove.update((current_ai_tags & managed_ids) - tags_to_add)
 
     ai_tagged_id = get_ai_tagged_tag_id()
     if apply_ai_tagged_tag and ai_tagged_id:
@@ -5,25 +5,62 @@ from stash_ai_server.actions.registry import action
 from stash_ai_server.actions.models import ContextRule, ContextInput
 from stash_ai_server.tasks.models import TaskRecord
 from stash_ai_server.utils.stash_api import stash_api
-from . import logic
+
+
+_BOOL_STRS = {
+    "1": True,
+    "true": True,
+    "yes": True,
+    "on": True,
+    "0": False,
+    "false": False,
+    "no": False,
+    "off": False,
+}
 
 
 def _coerce_bool(value: object, default: bool) -> bool:
-    if isinstance(value, bool):
-        return value
+    if value is True:
+        return True
+    if value is False:
+        return False
     if value is None:
         return default
     if isinstance(value, (int, float)):
         return bool(value)
     if isinstance(value, str):
-        lowered = value.strip().lower()
-        if lowered in {"1", "true", "yes", "on"}:
-            return True
-        if lowered in {"0", "false", "no", "off"}:
-            return False
+        return _BOOL_STRS.get(value.strip().lower(), default)
     return default
 
 
+def _tagging_action(name: str, page: str, selection: str, *, id: str, label: str, description: str):
+    """Build a tagging action for one page/selection combination.
+
+    Every variant shares the same handler body; only the context rule differs.
+    The ``none`` selection targets the whole library, so its ids are fetched first.
+    """
+    is_images = page == "images"
+    fetch_all = None
+    if selection == "none":
+        fetch_all = stash_api.get_all_images_async if is_images else stash_api.get_all_scenes_async
+
+    async def handler(self, ctx: ContextInput, params: dict, task_record: TaskRecord):
+        from . import logic
+        if fetch_all is not None:
+            ctx.selected_ids = await fetch_all()
+        run = logic.tag_images if is_images else logic.tag_scenes
+        return await run(self, ctx, params, task_record)
+
+    handler.__name__ = name
+    return action(
+        id=id,
+        label=label,
+        description=description,
+        result_kind="dialog",
+        contexts=[ContextRule(pages=[page], selection=selection)],
+    )(handler)
+
+
 class SkierAITaggingService(RemoteServiceBase):
     name = "AI_Tagging"
     description = "AI tagging and analysis service"
@@ -55,91 +92,75 @@ class SkierAITaggingService(RemoteServiceBase):
     # Image actions
     # ------------------------------------------------------------------
 
-    @action(
+    tag_image_single = _tagging_action(
+        "tag_image_single",
+        "images",
+        "single",
         id="skier.ai_tag.image",
         label="AI Tag Image",
         description="Generate tag suggestions for an image",
-        result_kind="dialog",
-        contexts=[ContextRule(pages=["images"], selection="single")],
     )
-    async def tag_image_single(self, ctx: ContextInput, params: dict, task_record: TaskRecord):
-        return await logic.tag_images(self, ctx, params, task_record)
-
-    @action(
+    tag_image_selected = _tagging_action(
+        "tag_image_selected",
+        "images",
+        "multi",
         id="skier.ai_tag.image.selected",
         label="Tag Selected Images",
         description="Generate tag suggestions for selected images",
-        result_kind="dialog",
-        contexts=[ContextRule(pages=["images"], selection="multi")],
     )
-    async def tag_image_selected(self, ctx: ContextInput, params: dict, task_record: TaskRecord):
-        return await logic.tag_images(self, ctx, params, task_record)
-
-    @action(
+    tag_image_page = _tagging_action(
+        "tag_image_page",
+        "images",
+        "page",
         id="skier.ai_tag.image.page",
         label="Tag Page Images",
         description="Generate tag suggestions for all images on the current page",
-        result_kind="dialog",
-        contexts=[ContextRule(pages=["images"], selection="page")],
     )
-    async def tag_image_page(self, ctx: ContextInput, params: dict, task_record: TaskRecord):
-        return await logic.tag_images(self, ctx, params, task_record)
-
-    @action(
+    tag_image_all = _tagging_action(
+        "tag_image_all",
+        "images",
+        "none",
         id="skier.ai_tag.image.all",
         label="Tag All Images",
         description="Analyze every image in the library",
-        result_kind="dialog",
-        contexts=[ContextRule(pages=["images"], selection="none")],
     )
-    async def tag_image_all(self, ctx: ContextInput, params: dict, task_record: TaskRecord):
-        ctx.selected_ids = await stash_api.get_all_images_async()
-        return await logic.tag_images(self, ctx, params, task_record)
 
     # ------------------------------------------------------------------
     # Scene actions - use controller pattern to spawn child tasks
     # ------------------------------------------------------------------
 
-    @action(
+    tag_scene_single = _tagging_action(
+        "tag_scene_single",
+        "scenes",
+        "single",
         id="skier.ai_tag.scene",
         label="AI Tag Scene",
         description="Analyze a scene for tag segments",
-        result_kind="dialog",
-        contexts=[ContextRule(pages=["scenes"], selection="single")],
     )
-    async def tag_scene_single(self, ctx: ContextInput, params: dict, task_record: TaskRecord):
-        return await logic.tag_scenes(self, ctx, params, task_record)
-
-    @action(
+    tag_scene_selected = _tagging_action(
+        "tag_scene_selected",
+        "scenes",
+        "multi",
         id="skier.ai_tag.scene.selected",
         label="Tag Selected Scenes",
         description="Analyze selected scenes for tag segments",
-        result_kind="dialog",
-        contexts=[ContextRule(pages=["scenes"], selection="multi")],
     )
-    async def tag_scene_selected(self, ctx: ContextInput, params: dict, task_record: TaskRecord):
-        return await logic.tag_scenes(self, ctx, params, task_record)
-
-    @action(
+    tag_scene_page = _tagging_action(
+        "tag_scene_page",
+        "scenes",
+        "page",
         id="skier.ai_tag.scene.page",
         label="Tag Page Scenes",
         description="Analyze every scene visible in the current list view",
-        result_kind="dialog",
-        contexts=[ContextRule(pages=["scenes"], selection="page")],
     )
-    async def tag_scene_page(self, ctx: ContextInput, params: dict, task_record: TaskRecord):
-        return await logic.tag_scenes(self, ctx, params, task_record)
-
-    @action(
+    tag_scene_all = _tagging_action(
+        "tag_scene_all",
+        "scenes",
+        "none",
         id="skier.ai_tag.scene.all",
         label="Tag All Scenes",
         description="Analyze every scene in the library",
-        result_kind="dialog",
-        contexts=[ContextRule(pages=["scenes"], selection="none")],
     )
-    async def tag_scene_all(self, ctx: ContextInput, params: dict, task_record: TaskRecord):
-        ctx.selected_ids = await stash_api.get_all_scenes_async()
-        return await logic.tag_scenes(self, ctx, params, task_record)
 
 def register():
     services.register(SkierAITaggingService())
@@ -147,4 +168,6 @@ def register():
     # Register plugin router for API endpoints
     from stash_ai_server.plugin_runtime import loader as plugin_loader
     from . import api_endpoints
+    api_endpoints._get_plugin_service.cache_clear()
+    api_endpoints.invalidate_plugin_status_cache()
     plugin_loader.register_plugin_router('skier_aitagging', api_endpoints.register_routes())
\ No newline at end of file
@@ -1,4 +1,9 @@
+import asyncio
 import logging
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Collection
 from stash_ai_server.utils.stash_api import stash_api
 
 _log = logging.getLogger(__name__)
@@ -8,6 +13,9 @@ def _to_int_list(values: list[int | str] | None) -> list[int]:
     out: list[int] = []
     if not values:
         return out
+    # Ids from Stash responses are usually ints already; skip per-item conversion then
+    if all(type(v) is int for v in values):
+        return list(values)
     for v in values:
         try:
             out.append(int(v))
@@ -16,7 +24,6 @@ def _to_int_list(values: list[int | str] | None) -> list[int]:
     return out
 
 AI_Base_Tag_Name = "AI"
-AI_Base_Tag_Id = stash_api.fetch_tag_id(AI_Base_Tag_Name, create_if_missing=True)
 
 AI_Error_Tag_Name = "AI_Errored"
 
@@ -24,74 +31,280 @@ AI_Tagged_Tag_Name = "AI_Tagged"
 
 AI_Reprocess_Tag_Name = "AI_Reprocess"
 
-VR_TAG_NAME = stash_api.stash_interface.get_configuration()["ui"].get("vrTag", None)
-VR_Tag_Id = stash_api.fetch_tag_id(VR_TAG_NAME) if VR_TAG_NAME else None
-AI_Error_Tag_Id = stash_api.fetch_tag_id(AI_Error_Tag_Name, parent_id=AI_Base_Tag_Id, create_if_missing=True)
-AI_Tagged_Tag_Id = stash_api.fetch_tag_id(AI_Tagged_Tag_Name, create_if_missing=True)
-AI_Reprocess_Tag_Id = stash_api.fetch_tag_id(AI_Reprocess_Tag_Name, parent_id=AI_Base_Tag_Id, create_if_missing=True)
+# Tag ids are resolved (and created if missing) on first use instead of at import,
+# so loading the plugin never blocks on, or fails because of, an unreachable Stash.
+_UNSET = object()
 
-#TODO: could be nice to not have to rely on the parent logic
-AI_tags_cache = stash_api.get_tags_with_parent(parent_tag_id=AI_Base_Tag_Id)
+# Find-or-create of a label is check-then-create on the Stash side; callers on
+# worker threads hold this so two tasks never try to create the same tag at once.
+_TAG_CREATE_LOCK = Lock()
 
-AI_tags_cache[AI_Error_Tag_Name] = AI_Error_Tag_Id
-if AI_Tagged_Tag_Id is not None:
-    AI_tags_cache[AI_Tagged_Tag_Name] = AI_Tagged_Tag_Id
-if AI_Reprocess_Tag_Id is not None:
-    AI_tags_cache[AI_Reprocess_Tag_Name] = AI_Reprocess_Tag_Id
+# The VR tag is user-configurable in the Stash UI; re-read it every few minutes
+VR_TAG_CACHE_SECONDS = 300.0
 
 
-def has_ai_tagged(tags: list[int | str]) -> bool:
+@dataclass(slots=True)
+class _TagRegistry:
+    """Lazily resolved Stash tag ids; ``_UNSET`` marks ids not looked up yet."""
+
+    ai_base: int | None | object = _UNSET
+    ai_error: int | None | object = _UNSET
+    ai_tagged: int | None | object = _UNSET
+    ai_reprocess: int | None | object = _UNSET
+    vr: int | None | object = _UNSET
+    vr_name: str | None = None
+    vr_checked_at: float | None = None
+    ai_tags: dict[str, int] | None = None
+
+
+_REGISTRY = _TagRegistry()
+
+
+def _get_ai_base_tag_id() -> int | None:
+    if _REGISTRY.ai_base is _UNSET:
+        _REGISTRY.ai_base = stash_api.fetch_tag_id(AI_Base_Tag_Name, create_if_missing=True)
+    return _REGISTRY.ai_base
+
+
+def _get_ai_error_tag_id() -> int | None:
+    if _REGISTRY.ai_error is _UNSET:
+        _REGISTRY.ai_error = stash_api.fetch_tag_id(
+            AI_Error_Tag_Name, parent_id=_get_ai_base_tag_id(), create_if_missing=True
+        )
+    return _REGISTRY.ai_error
+
+
+def _get_ai_tagged_tag_id() -> int | None:
+    if _REGISTRY.ai_tagged is _UNSET:
+        _REGISTRY.ai_tagged = stash_api.fetch_tag_id(AI_Tagged_Tag_Name, create_if_missing=True)
+    return _REGISTRY.ai_tagged
+
+
+def _get_ai_reprocess_tag_id() -> int | None:
+    if _REGISTRY.ai_reprocess is _UNSET:
+        _REGISTRY.ai_reprocess = stash_api.fetch_tag_id(
+            AI_Reprocess_Tag_Name, parent_id=_get_ai_base_tag_id(), create_if_missing=True
+        )
+    return _REGISTRY.ai_reprocess
+
+
+def _refresh_vr_tag() -> None:
+    """Re-read the VR tag setting (and its id when it changed).
+
+    Blocking; run it in a worker thread. When Stash cannot be reached the last
+    known tag is kept and the next attempt waits for the TTL again.
+    """
+    try:
+        vr_tag_name = stash_api.stash_interface.get_configuration()["ui"].get("vrTag", None)
+        vr_tag_id = _REGISTRY.vr
+        if vr_tag_id is _UNSET or vr_tag_name != _REGISTRY.vr_name:
+            # A renamed VR tag invalidates the resolved id as well
+            vr_tag_id = stash_api.fetch_tag_id(vr_tag_name) if vr_tag_name else None
+    except Exception:
+        _log.exception("Failed to refresh the Stash VR tag; keeping vr_tag=%s", _REGISTRY.vr_name)
+    else:
+        _REGISTRY.vr = vr_tag_id
+        _REGISTRY.vr_name = vr_tag_name
+    _REGISTRY.vr_checked_at = time.monotonic()
+
+
+async def _get_vr_tag_id() -> int | None:
+    checked_at = _REGISTRY.vr_checked_at
+    if checked_at is None or time.monotonic() - checked_at > VR_TAG_CACHE_SECONDS:
+        await asyncio.to_thread(_refresh_vr_tag)
+    vr_tag_id = _REGISTRY.vr
+    return None if vr_tag_id is _UNSET else vr_tag_id
+
+
+def _get_ai_tags_cache() -> dict[str, int]:
+    if _REGISTRY.ai_tags is None:
+        #TODO: could be nice to not have to rely on the parent logic
+        cache = stash_api.get_tags_with_parent(parent_tag_id=_get_ai_base_tag_id())
+
+        cache[AI_Error_Tag_Name] = _get_ai_error_tag_id()
+        ai_tagged_tag_id = _get_ai_tagged_tag_id()
+        if ai_tagged_tag_id is not None:
+            cache[AI_Tagged_Tag_Name] = ai_tagged_tag_id
+        ai_reprocess_tag_id = _get_ai_reprocess_tag_id()
+        if ai_reprocess_tag_id is not None:
+            cache[AI_Reprocess_Tag_Name] = ai_reprocess_tag_id
+        _REGISTRY.ai_tags = cache
+    return _REGISTRY.ai_tags
+
+
+_warm_lock = asyncio.Lock()
+
+
+async def warm_ai_tag_ids() -> None:
+    """Resolve the standard AI tag ids and the AI tag cache ahead of the sync accessors.
+
+    The base tag is resolved first since the others are created under it; the
+    remaining lookups then run concurrently instead of one after another. The
+    lock keeps two actions starting together from both creating the same tags.
+    Failures are only logged; the lazy accessors retry on their next use.
+    """
+    if _REGISTRY.ai_tags is not None:
+        # Building the tag cache resolves every standard id, so nothing is left to warm
+        return
+    async with _warm_lock:
+        try:
+            if _REGISTRY.ai_base is _UNSET:
+                await asyncio.to_thread(_get_ai_base_tag_id)
+            pending = [
+                getter
+                for field, getter in (
+                    ("ai_error", _get_ai_error_tag_id),
+                    ("ai_tagged", _get_ai_tagged_tag_id),
+                    ("ai_reprocess", _get_ai_reprocess_tag_id),
+                )
+                if getattr(_REGISTRY, field) is _UNSET
+            ]
+            if pending:
+                await asyncio.gather(*(asyncio.to_thread(getter) for getter in pending))
+            if _REGISTRY.ai_tags is None:
+                await asyncio.to_thread(_get_ai_tags_cache)
+        except Exception:
+            _log.exception("Failed to resolve standard AI tag ids")
+
+
+def _has_tag_id(tags: Collection[int | str] | None, tag_id: int | None) -> bool:
+    """Membership test that accepts int or str ids without normalizing the whole collection."""
+    if not tag_id or not tags:
+        return False
+    return tag_id in tags or str(tag_id) in tags
+
+
+def has_ai_tagged(tags: Collection[int | str] | None) -> bool:
     """Check if the scene has the AI_Tagged tag."""
-    global AI_Tagged_Tag_Id
-    normalized = _to_int_list(tags)
-    return AI_Tagged_Tag_Id in normalized if AI_Tagged_Tag_Id else False
+    return _has_tag_id(tags, _get_ai_tagged_tag_id())
 
 
-def has_ai_reprocess(tags: list[int | str]) -> bool:
+def has_ai_reprocess(tags: Collection[int | str] | None) -> bool:
     """Check if the AI_Reprocess tag is applied."""
-    global AI_Reprocess_Tag_Id
-    normalized = _to_int_list(tags)
-    return AI_Reprocess_Tag_Id in normalized if AI_Reprocess_Tag_Id else False
+    return _has_tag_id(tags, _get_ai_reprocess_tag_id())
 
 def remove_ai_tags_from_images(image_ids: list[int | str]) -> None:
     """Remove all AI tags from the given images."""
-    if not AI_tags_cache:
+    ai_tags_cache = _get_ai_tags_cache()
+    if not ai_tags_cache:
         _log.warning("No AI tags in cache; nothing to remove")
         return
-    stash_api.remove_tags_from_images(_to_int_list(image_ids), list(AI_tags_cache.values()))
+    stash_api.remove_tags_from_images(_to_int_list(image_ids), list(ai_tags_cache.values()))
 
 def add_error_tag_to_images(image_ids: list[int | str]) -> None:
     """Add the AI_Errored tag to the given images."""
-    if AI_Error_Tag_Id is None:
-        _log.warning("AI_Error_Tag_Id is None; cannot add error tag")
+    ai_error_tag_id = _get_ai_error_tag_id()
+    if ai_error_tag_id is None:
+        _log.warning("AI_Errored tag id is unavailable; cannot add error tag")
+        return
+    stash_api.add_tags_to_images(_to_int_list(image_ids), [ai_error_tag_id])
+
+
+async def add_error_tag_to_images_async(image_ids: list[int | str]) -> None:
+    """Async variant of ``add_error_tag_to_images``; pass all image ids in one call."""
+    ai_error_tag_id = _get_ai_error_tag_id()
+    if ai_error_tag_id is None:
+        _log.warning("AI_Errored tag id is unavailable; cannot add error tag")
         return
-    stash_api.add_tags_to_images(_to_int_list(image_ids), [AI_Error_Tag_Id])
+    await stash_api.add_tags_to_images_async(_to_int_list(image_ids), [ai_error_tag_id])
 
 
 async def remove_reprocess_tag_from_scene(scene_id: int) -> None:
     """Remove AI_Reprocess from a scene once reprocessing is finished."""
-    global AI_Reprocess_Tag_Id
-    if AI_Reprocess_Tag_Id is None:
+    ai_reprocess_tag_id = _get_ai_reprocess_tag_id()
+    if ai_reprocess_tag_id is None:
         return
     try:
-        await stash_api.remove_tags_from_scene_async(scene_id, [AI_Reprocess_Tag_Id])
+        await stash_api.remove_tags_from_scene_async(scene_id, [ai_reprocess_tag_id])
     except Exception:
         _log.exception("Failed to remove AI_Reprocess tag from scene_id=%s", scene_id)
 
 
 async def remove_reprocess_tag_from_images(image_ids: list[int | str]) -> None:
     """Remove AI_Reprocess from images that finished reprocessing."""
-    global AI_Reprocess_Tag_Id
-    if AI_Reprocess_Tag_Id is None or not image_ids:
+    if not image_ids:
+        return
+    ai_reprocess_tag_id = _get_ai_reprocess_tag_id()
+    if ai_reprocess_tag_id is None:
         return
     try:
-        await stash_api.remove_tags_from_images_async(_to_int_list(image_ids), [AI_Reprocess_Tag_Id])
+        await stash_api.remove_tags_from_images_async(_to_int_list(image_ids), [ai_reprocess_tag_id])
     except Exception:
         _log.exception("Failed to remove AI_Reprocess tag from image_ids=%s", image_ids)
 
+def _ensure_ai_tag_id(name: str, base_id: int | None, ai_tags_cache: dict[str, int]) -> int | None:
+    """Find or create one AI tag, serialized with every other tag creation.
+
+    Known tags are answered from the cache without touching the lock, so callers
+    on the event loop only wait when they actually have to create a tag.
+    """
+    cached = ai_tags_cache.get(name)
+    if cached is not None:
+        return cached
+    with _TAG_CREATE_LOCK:
+        return stash_api.fetch_tag_id(
+            name, parent_id=base_id, create_if_missing=True, add_to_cache=ai_tags_cache
+        )
+
+
+def _ensure_ai_tag_ids(
+    names: list[str], base_id: int | None, ai_tags_cache: dict[str, int]
+) -> dict[str, int | None]:
+    resolved: dict[str, int | None] = {}
+    for name in names:
+        try:
+            resolved[name] = _ensure_ai_tag_id(name, base_id, ai_tags_cache)
+        except Exception:
+            _log.exception("Failed to resolve AI tag reference for label=%s", name)
+            resolved[name] = None
+    return resolved
+
+
 def get_ai_tag_ids_from_names(tag_names: list[str]) -> list[int]:
     """Get tag IDs for the given tag names, creating them if necessary."""
-    return [stash_api.fetch_tag_id(tag, parent_id=AI_Base_Tag_Id, create_if_missing=True, add_to_cache=AI_tags_cache) for tag in tag_names]
+    base_id = _get_ai_base_tag_id()
+    ai_tags_cache = _get_ai_tags_cache()
+    return [_ensure_ai_tag_id(tag, base_id, ai_tags_cache) for tag in tag_names]
+
+
+async def get_ai_tag_ids_from_names_async(tag_names: list[str]) -> list[int | None]:
+    """Resolve tag IDs for many names, fetching only uncached names and doing so concurrently.
+
+    Existing tags are looked up concurrently; names that still have no tag are
+    then created one at a time so concurrent tasks never race to create the
+    same label. Names that fail to resolve map to None, matching
+    ``resolve_ai_tag_reference``.
+    """
+    await warm_ai_tag_ids()
+    base_id = _get_ai_base_tag_id()
+    ai_tags_cache = _get_ai_tags_cache()
+    missing = list(dict.fromkeys(name for name in tag_names if name and name not in ai_tags_cache))
+    fetched: dict[str, int | None] = {}
+    if missing:
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    stash_api.fetch_tag_id,
+                    name,
+                    parent_id=base_id,
+                    add_to_cache=ai_tags_cache,
+                )
+                for name in missing
+            ),
+            return_exceptions=True,
+        )
+        to_create: list[str] = []
+        for name, result in zip(missing, results):
+            if isinstance(result, BaseException):
+                _log.warning("Lookup of AI tag label=%s failed; retrying as create", name, exc_info=result)
+                result = None
+            if result is None:
+                to_create.append(name)
+            else:
+                fetched[name] = result
+        if to_create:
+            fetched.update(await asyncio.to_thread(_ensure_ai_tag_ids, to_create, base_id, ai_tags_cache))
+    return [ai_tags_cache.get(name, fetched.get(name)) if name else None for name in tag_names]
 
 
 def resolve_ai_tag_reference(label: str) -> int | None:
@@ -99,28 +312,19 @@ def resolve_ai_tag_reference(label: str) -> int | None:
     if not label:
         return None
     try:
-        return stash_api.fetch_tag_id(
-            label,
-            parent_id=AI_Base_Tag_Id,
-            create_if_missing=True,
-            add_to_cache=AI_tags_cache,
-        )
+        return _ensure_ai_tag_id(label, _get_ai_base_tag_id(), _get_ai_tags_cache())
     except Exception:
         _log.exception("Failed to resolve AI tag reference for label=%s", label)
         return None
 
-def is_vr_scene(tag_ids: list[int | str]) -> bool:
+async def is_vr_scene(tag_ids: Collection[int | str] | None) -> bool:
     """Check if the scene is tagged as VR."""
-    global VR_Tag_Id
-    normalized = _to_int_list(tag_ids)
-    return VR_Tag_Id in normalized if VR_Tag_Id else False
+    return _has_tag_id(tag_ids, await _get_vr_tag_id())
 
 def get_ai_tagged_tag_id() -> int | None:
     """Get the tag ID for the AI_Tagged tag."""
-    global AI_Tagged_Tag_Id
-    return AI_Tagged_Tag_Id
+    return _get_ai_tagged_tag_id()
 
 def get_ai_tags_cache() -> dict[str, int]:
     """Get the cache of AI tag names to IDs."""
-    global AI_tags_cache
-    return AI_tags_cache
\ No newline at end of file
+    return _get_ai_tags_cache()
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import csv
 import logging
+import os
 import shutil
+import tempfile
 from dataclasses import dataclass, replace
 from pathlib import Path
 from threading import Lock
@@ -14,6 +16,8 @@ _log = logging.getLogger(__name__)
 
 _CONFIG_FILENAME = "tag_settings.csv"
 _TEMPLATE_FILENAME = "tag_settings.template.csv"
+# tag_name values that mark the global default row rather than a specific tag
+_DEFAULT_TAG_NAMES = frozenset({"", "*", "default", "__default__"})
 
 
 # TODO: We shouldn't be running db queries directly here to get plugin settings
@@ -25,12 +29,12 @@ def _get_tag_suffix() -> str:
         from stash_ai_server.models.plugin import PluginSetting
 
         with SessionLocal() as session:
-            row = session.execute(
+            row = session.scalar(
                 select(PluginSetting).where(
                     PluginSetting.plugin_name == "skier_aitagging",
                     PluginSetting.key == "tag_suffix",
                 )
-            ).scalar_one_or_none()
+            )
 
             if row is not None:
                 value = row.value if row.value is not None else row.default_value
@@ -122,9 +126,6 @@ def _migrate_csv_schema(config_path: Path, template_path: Path) -> bool:
     Returns:
         True if migration was performed, False if no migration needed
     """
-    import os
-    import tempfile
-
     if not config_path.exists():
         return False
 
@@ -141,7 +142,7 @@ def _migrate_csv_schema(config_path: Path, template_path: Path) -> bool:
                     tag_name = (
                         (row.get("tag_name") or row.get("tag") or "").strip().lower()
                     )
-                    if tag_name and tag_name not in {"", "*", "default", "__default__"}:
+                    if tag_name not in _DEFAULT_TAG_NAMES:
                         template_rows_by_tag[tag_name] = dict(row)
         except Exception as exc:
             _log.warning("Failed to read template CSV for migration: %s", exc)
@@ -237,15 +238,23 @@ class TagConfiguration:
         return self._tag_suffix
 
     def resolve(self, tag_name: str) -> TagSettings:
+        suffix = (self._tag_suffix or "").strip()
+        return self._resolve(tag_name, suffix, suffix.lower())
+
+    def resolve_many(self, tag_names: Iterable[str]) -> Dict[str, TagSettings]:
+        """Resolve several tags at once, keyed by the names as given."""
+        suffix = (self._tag_suffix or "").strip()
+        suffix_lower = suffix.lower()
+        return {name: self._resolve(name, suffix, suffix_lower) for name in tag_names}
+
+    def _resolve(self, tag_name: str, suffix: str, suffix_lower: str) -> TagSettings:
         normalized = (tag_name or "").strip()
         override = self._overrides.get(normalized.lower()) if normalized else None
 
-        suffix = (self._tag_suffix or "").strip()
         base_name = normalized
 
         if not override and normalized and suffix:
             norm_lower = normalized.lower()
-            suffix_lower = suffix.lower()
             if norm_lower.endswith(suffix_lower) and len(normalized) > len(suffix):
                 stripped = normalized[: -len(suffix)].strip()
                 if stripped:
@@ -265,7 +274,7 @@ class TagConfiguration:
             if (
                 suffix
                 and stash_base
-                and not stash_base.lower().endswith(suffix.lower())
+                and not stash_base.lower().endswith(suffix_lower)
             ):
                 effective.stash_name = stash_base + suffix
             else:
@@ -278,7 +287,7 @@ class TagConfiguration:
     def iter_overrides(self) -> Iterable[Tuple[str, TagSettingsOverride]]:
         return self._overrides.items()
 
-    def update_tag_settings(self, tag_settings_map: Dict[str, Dict]) -> None:
+    def update_tag_settings(self, tag_settings_map: Dict[str, Dict]) -> int:
         """Update full tag settings for tags in the CSV file.
 
         Args:
@@ -287,22 +296,37 @@ class TagConfiguration:
                 - required_scene_tag_duration: str (optional, e.g., "15", "15s", "35%")
                 - min_marker_duration: float (optional)
                 - max_gap: float (optional)
+
+        Returns:
+            Number of rows whose values actually changed. The file is left
+            untouched when nothing changed.
         """
-        import os
-        import tempfile
+        # Each save reads the file, writes a patched copy and swaps it in; two
+        # saves interleaving would drop one's edits, so run them one at a time.
+        with _UPDATE_LOCK:
+            return self._rewrite_tag_settings(tag_settings_map)
 
+    def _rewrite_tag_settings(self, tag_settings_map: Dict[str, Dict]) -> int:
         if not self._source_path.exists():
             _log.warning(
                 "Cannot update tag settings: CSV file does not exist at %s",
                 self._source_path,
             )
-            return
+            return 0
 
-        # Read existing CSV
-        rows = []
-        fieldnames = None
+        # Stream rows straight into a temporary file, patching only the
+        # requested tags, then swap it in atomically
+        changed = 0
+        columns_added = False
+        temp_fd, temp_path = tempfile.mkstemp(
+            prefix="tag_settings_",
+            suffix=".csv",
+            dir=self._source_path.parent,
+            text=True,
+        )
         try:
-            with self._source_path.open("r", encoding="utf-8", newline="") as handle:
+            with os.fdopen(temp_fd, "w", encoding="utf-8", newline="") as out, \
+                    self._source_path.open("r", encoding="utf-8", newline="") as handle:
                 reader = csv.DictReader(handle)
                 fieldnames = list(reader.fieldnames) if reader.fieldnames else []
 
@@ -315,6 +339,7 @@ class TagConfiguration:
                 ]
                 for col in required_cols:
                     if col not in fieldnames:
+                        columns_added = True
                         # Insert after appropriate column
                         if col == "markers_enabled" and "tag_name" in fieldnames:
                             fieldnames.insert(fieldnames.index("tag_name") + 1, col)
@@ -339,22 +364,21 @@ class TagConfiguration:
                         else:
                             fieldnames.append(col)
 
+                writer = csv.DictWriter(out, fieldnames=fieldnames)
+                writer.writeheader()
+
                 for row in reader:
                     # Get tag name (normalized)
                     tag_name = (row.get("tag_name") or row.get("tag") or "").strip()
-                    if not tag_name or tag_name.lower() in {
-                        "",
-                        "*",
-                        "default",
-                        "__default__",
-                    }:
+                    if tag_name.lower() in _DEFAULT_TAG_NAMES:
                         # Keep default row as-is
-                        rows.append(row)
+                        writer.writerow(row)
                         continue
 
                     normalized_tag = tag_name.lower()
                     if normalized_tag in tag_settings_map:
                         settings = tag_settings_map[normalized_tag]
+                        original = dict(row)
 
                         # Update scene_tag_enabled
                         if "scene_tag_enabled" in settings and settings["scene_tag_enabled"] is not None:
@@ -400,23 +424,15 @@ class TagConfiguration:
                             else:
                                 row["max_gap"] = ""
 
-                    rows.append(row)
-        except Exception as exc:
-            _log.exception("Failed to read CSV file for update: %s", exc)
-            raise
+                        if row != original:
+                            changed += 1
 
-        # Write to temporary file first (atomic write)
-        temp_fd, temp_path = tempfile.mkstemp(
-            prefix="tag_settings_",
-            suffix=".csv",
-            dir=self._source_path.parent,
-            text=True,
-        )
-        try:
-            with os.fdopen(temp_fd, "w", encoding="utf-8", newline="") as handle:
-                writer = csv.DictWriter(handle, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(rows)
+                    writer.writerow(row)
+
+            if not changed and not columns_added:
+                os.unlink(temp_path)
+                _log.debug("Tag settings unchanged; skipping rewrite of %s", self._source_path)
+                return 0
 
             # Atomic rename
             os.replace(temp_path, self._source_path)
@@ -428,6 +444,7 @@ class TagConfiguration:
                 _CONFIG_CACHE = TagConfiguration.load(
                     base_path=self._source_path.parent
                 )
+            return changed
         except Exception as exc:
             # Clean up temp file on error
             try:
@@ -435,7 +452,7 @@ class TagConfiguration:
                     os.unlink(temp_path)
             except:
                 pass
-            _log.exception("Failed to write updated CSV file: %s", exc)
+            _log.exception("Failed to update tag settings file %s: %s", self._source_path, exc)
             raise
 
     @classmethod
@@ -481,13 +498,19 @@ class TagConfiguration:
         if config_path.exists():
             try:
                 with config_path.open("r", encoding="utf-8", newline="") as handle:
-                    reader = csv.DictReader(handle)
-                    if reader.fieldnames is None:
+                    reader = csv.reader(handle)
+                    header = next(reader, None)
+                    if header is None:
                         _log.warning(
                             "Tag settings file %s is missing a header row", config_path
                         )
-                    for idx, raw_row in enumerate(reader, start=2):
-                        tag_key, override = _parse_row(idx, raw_row)
+                    # Normalize the header once and bind each column to its index
+                    # rather than building and re-keying a dict for every row.
+                    columns = {
+                        _normalize_key(name): idx for idx, name in enumerate(header or ())
+                    }
+                    for idx, row in enumerate(reader, start=2):
+                        tag_key, override = _parse_row(idx, row, columns)
                         if override is None:
                             continue
                         if tag_key is None:
@@ -509,6 +532,7 @@ class TagConfiguration:
 
 _CONFIG_CACHE: TagConfiguration | None = None
 _CONFIG_LOCK = Lock()
+_UPDATE_LOCK = Lock()
 
 
 def get_tag_configuration(*, reload: bool = False) -> TagConfiguration:
@@ -542,40 +566,36 @@ def resolve_backend_to_stash_tag_id(
 
 
 def _parse_row(
-    row_number: int, raw_row: dict[str, str]
+    row_number: int, row: list[str], columns: dict[str, int]
 ) -> tuple[str | None, TagSettingsOverride | None]:
-    normalized = {}
-    for key, value in (raw_row or {}).items():
-        if key is None:
-            continue
-        norm_key = _normalize_key(key)
-        if isinstance(value, str):
-            normalized[norm_key] = value.strip()
-        else:
-            normalized[norm_key] = value
-    if not any(
-        str(value).strip() for value in normalized.values() if value is not None
-    ):
+    width = len(row)
+
+    def cell(key: str) -> str | None:
+        idx = columns.get(key)
+        if idx is None or idx >= width:
+            return None
+        return row[idx].strip()
+
+    if not any(row[idx].strip() for idx in columns.values() if idx < width):
         return None, None
 
-    tag_value = normalized.get("tagname") or normalized.get("tag")
-    tag_value = tag_value.strip() if isinstance(tag_value, str) else ""
+    tag_value = cell("tagname") or cell("tag") or ""
     override = TagSettingsOverride()
-    override.stash_name = _normalize_string(normalized.get("stashname"))
-    override.markers_enabled = _parse_bool(normalized.get("markersenabled"))
-    override.scene_tag_enabled = _parse_bool(normalized.get("scenetagenabled"))
-    override.image_enabled = _parse_bool(normalized.get("imageenabled"))
+    override.stash_name = _normalize_string(cell("stashname"))
+    override.markers_enabled = _parse_bool(cell("markersenabled"))
+    override.scene_tag_enabled = _parse_bool(cell("scenetagenabled"))
+    override.image_enabled = _parse_bool(cell("imageenabled"))
     override.required_scene_tag_duration = _parse_required_scene_duration(
-        normalized.get("requiredscenetagduration")
+        cell("requiredscenetagduration")
     )
-    override.min_marker_duration = _parse_float(normalized.get("minmarkerduration"))
-    override.max_gap = _parse_float(normalized.get("maxgap"))
-    override.merge_strategy = _normalize_string(normalized.get("mergestrategy"))
+    override.min_marker_duration = _parse_float(cell("minmarkerduration"))
+    override.max_gap = _parse_float(cell("maxgap"))
+    override.merge_strategy = _normalize_string(cell("mergestrategy"))
     override.merge_params = tuple(
-        _parse_float(normalized.get(f"markermergeparam{idx}")) for idx in range(1, 6)
+        _parse_float(cell(f"markermergeparam{idx}")) for idx in range(1, 6)
     )
 
-    if tag_value in {"", "*", "default", "__default__"}:
+    if tag_value in _DEFAULT_TAG_NAMES:
         return None, override
     normalized_key = tag_value.lower()
     return normalized_key, override
@@ -622,17 +642,24 @@ def _normalize_string(value: object) -> str | None:
     return result or None
 
 
+_BOOL_STRS = {
+    "1": True,
+    "true": True,
+    "yes": True,
+    "y": True,
+    "0": False,
+    "false": False,
+    "no": False,
+    "n": False,
+}
+
+
 def _parse_bool(value: object) -> bool | None:
     if value is None:
         return None
     if isinstance(value, bool):
         return value
-    text = str(value).strip().lower()
-    if text in {"1", "true", "yes", "y"}:
-        return True
-    if text in {"0", "false", "no", "n"}:
-        return False
-    return None
+    return _BOOL_STRS.get(str(value).strip().lower())
 
 
 def _parse_float(value: object) -> float | None:
@@ -7,7 +7,7 @@ from typing import Any, Mapping, Sequence
 from stash_ai_server.actions.models import ContextInput
 from stash_ai_server.utils.stash_api import stash_api
 
-from .stash_handler import resolve_ai_tag_reference
+from .stash_handler import get_ai_tag_ids_from_names_async
 
 
 _log = logging.getLogger(__name__)
@@ -36,71 +36,53 @@ def get_selected_items(ctx: ContextInput) -> list[str]:
         # TODO
         return []
 
-def resolve_image_tag_id_from_label(label: str, config) -> int | None:
-    """Resolve a configured image tag label to a concrete Stash tag id.
-    
-    Note: This function does NOT filter by enabled status - it always resolves
-    the tag ID so that tags can be stored in the DB regardless of enabled status.
-    Filtering by enabled status should happen later when applying tags to Stash.
-    """
-
-    normalized = (label or "").strip()
-    if not normalized:
-        _log.warning("Failed to resolve image tag label '%s': empty or invalid", label)
-        return None
-    settings = config.resolve(normalized)
-    stash_name = settings.stash_name or normalized
-    if not stash_name:
-        _log.warning("Failed to resolve image tag label '%s': no stash name found", label)
-        return None
-    return resolve_ai_tag_reference(stash_name)
-
-
-def filter_enabled_tag_ids(tag_ids: Sequence[int], config) -> list[int]:
+async def filter_enabled_tag_ids(tag_ids: Sequence[int], config) -> list[int]:
     """Normalize cached tag ids to match current configuration constraints.
     
     This function filters tags by enabled status - only enabled tags are returned.
     Use this when applying tags to Stash UI, not when storing to DB.
+    Tag ids for the enabled tags are resolved in one batch.
     """
 
-    filtered: list[int] = []
-    applied: set[int] = set()
-    for tag_id in tag_ids:
-        tag_name = stash_api.get_stash_tag_name(tag_id)
-        if not tag_name:
-            continue
-        settings = config.resolve(tag_name)
+    tag_names = [name for name in map(stash_api.get_stash_tag_name, tag_ids) if name]
+    # Resolve every tag's settings in one call rather than once per loop iteration
+    resolved = config.resolve_many(tag_names)
+    stash_names: list[str] = []
+    for tag_name in tag_names:
+        settings = resolved[tag_name]
         if not settings.image_enabled:
             continue
-        stash_name = settings.stash_name or tag_name
-        candidate = resolve_ai_tag_reference(stash_name) if stash_name else None
-        if candidate is None:
-            continue
-        if candidate in applied:
-            continue
-        applied.add(candidate)
-        filtered.append(candidate)
-    return filtered
+        stash_names.append(settings.stash_name or tag_name)
+
+    candidates = await get_ai_tag_ids_from_names_async(stash_names)
+    return list(dict.fromkeys(candidate for candidate in candidates if candidate is not None))
 
 
-def collect_image_tag_records(tags_by_category: Mapping[str | None, Sequence[str]], config) -> dict[str | None, list[int]]:
+async def collect_image_tag_records(tags_by_category: Mapping[str | None, Sequence[str]], config) -> dict[str | None, list[int]]:
     """Build unique per-category image tag records while preserving raw labels.
     
     Note: This stores ALL detected tags to the DB regardless of enabled status.
     Filtering by enabled status happens later when applying tags to Stash.
+    Tag ids for every label are resolved in one batch.
     """
 
-    records: dict[str | None, list[int]] = {}
+    names_by_category: dict[str | None, list[str]] = {}
     for category_key, labels in tags_by_category.items():
         normalized_category = (category_key or "").strip() or None
-        bucket = records.setdefault(normalized_category, [])
+        bucket = names_by_category.setdefault(normalized_category, [])
         for raw_label in labels or []:
             normalized_label = (raw_label or "").strip()
             if not normalized_label:
                 continue
-            candidate_id = resolve_image_tag_id_from_label(normalized_label, config)
-            if candidate_id is not None:
-                bucket.append(candidate_id)
+            settings = config.resolve(normalized_label)
+            bucket.append(settings.stash_name or normalized_label)
+
+    unique_names = list(dict.fromkeys(name for names in names_by_category.values() for name in names))
+    tag_ids = dict(zip(unique_names, await get_ai_tag_ids_from_names_async(unique_names)))
+    records = {
+        category: [tag_ids[name] for name in names if tag_ids[name] is not None]
+        for category, names in names_by_category.items()
+    }
 
     # Drop empty buckets to keep downstream storage tidy
     return {category: entries for category, entries in records.items() if entries}
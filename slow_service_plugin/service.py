@@ -30,11 +30,11 @@ class SlowService(ServiceBase):
     )
     async def sleep_long(self, ctx: ContextInput, params: dict, task):
         total = float(params.get('seconds', 1.0))
-        step = 0.05; elapsed = 0.0
-        while elapsed < total:
-            await asyncio.sleep(step); elapsed += step
+        step = 0.05; start = time.monotonic(); deadline = start + total
+        while (remaining := deadline - time.monotonic()) > 0:
+            await asyncio.sleep(min(step, remaining))
             if getattr(task, 'cancel_requested', False):
-                return {'slept': elapsed, 'interrupted': True}
+                return {'slept': time.monotonic() - start, 'interrupted': True}
         return {'slept': total, 'interrupted': False}
 
     @action(
@@ -56,18 +56,21 @@ class SlowService(ServiceBase):
     )
     async def batch_spawn(self, ctx: ContextInput, params: dict, task):
         count = int(params.get('count', 3)); duration = float(params.get('seconds', 1.0)); hold = float(params.get('hold', 0))
-        reg = action_registry; spawned: list[str] = []
-        for i in range(count):
-            detail_ctx = ContextInput(page='scenes', entityId=f'scene-{i}', isDetailView=True, selectedIds=[])
-            resolved = reg.resolve('slow.sleep.long', detail_ctx)
-            if not resolved: continue
+        spawned: list[str] = []
+        # Every child is a single-scene detail context, so the action resolves the same way for all of them
+        resolved = action_registry.resolve('slow.sleep.long', ContextInput(page='scenes', entityId='scene-0', isDetailView=True, selectedIds=[]))
+        if resolved:
             definition, handler = resolved
-            child = task_manager.submit(definition, handler, detail_ctx, {'seconds': duration}, TaskPriority.normal, group_id=task.id)
-            spawned.append(child.id)
+            for i in range(count):
+                detail_ctx = ContextInput(page='scenes', entityId=f'scene-{i}', isDetailView=True, selectedIds=[])
+                child = task_manager.submit(definition, handler, detail_ctx, {'seconds': duration}, TaskPriority.normal, group_id=task.id)
+                spawned.append(child.id)
         if hold > 0:
-            elapsed = 0.0; step = 0.05
-            while elapsed < hold:
-                await asyncio.sleep(step); elapsed += step
+            # Sleep against a fixed deadline so the hold ends on time rather than
+            # drifting by the scheduling overhead of every poll step.
+            deadline = time.monotonic() + hold; step = 0.05
+            while (remaining := deadline - time.monotonic()) > 0:
+                await asyncio.sleep(min(step, remaining))
                 if getattr(task, 'cancel_requested', False): break
         return {'spawned': spawned, 'count': len(spawned)}
 